@@ -95,6 +95,8 @@ class ThreeJSBuilder:
         return layers
 
     def buildLayer(self, layer, cancelSignal=None):
+        self.imageManager.clearCache()
+
         if layer.geomType == q3dconst.TYPE_DEM:
             builder = DEMLayerBuilder(self.settings, layer, self.imageManager)
         elif layer.geomType == q3dconst.TYPE_POINTCLOUD:
@@ -104,6 +106,8 @@ class ThreeJSBuilder:
         return builder.build(cancelSignal=cancelSignal)
 
     def builders(self, layer):
+        self.imageManager.clearCache()
+
         if layer.geomType == q3dconst.TYPE_DEM:
             builder = DEMLayerBuilder(self.settings, layer, self.imageManager)
         elif layer.geomType == q3dconst.TYPE_POINTCLOUD:
@@ -21,6 +21,8 @@
 """
 import json
 import struct
+
+import numpy
 from PyQt5.QtCore import QByteArray, QSize
 from qgis.core import QgsGeometry, QgsPoint, QgsProject
 
@@ -189,7 +191,7 @@ class DEMBlockBuilder:
             if self.edgeRoughness == 1:
                 ba = self.provider.read(self.grid_size.width(), self.grid_size.height(), self.extent)
             else:
-                grid_values = list(self.provider.readValues(self.grid_size.width(), self.grid_size.height(), self.extent))
+                grid_values = numpy.asarray(self.provider.readValues(self.grid_size.width(), self.grid_size.height(), self.extent)).tolist()
                 self.processEdges(grid_values, self.edgeRoughness)
                 ba = struct.pack("{0}f".format(self.grid_size.width() * self.grid_size.height()), *grid_values)
 
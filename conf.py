@@ -33,6 +33,9 @@ RUN_CNTLR_IN_BKGND = True    # If True, controller runs in a worker thread
 # vector layer
 FEATURES_PER_BLOCK = 50   # max number of features in a data block
 
+# image
+PNG_QUALITY = 80          # Qt maps 0-100 to zlib level 9-0. 80 corresponds to level 1 (best speed)
+
 # default export settings
 
 
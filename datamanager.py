@@ -23,8 +23,9 @@ import os
 
 from PyQt5.QtCore import Qt, QSize, QUrl
 from PyQt5.QtGui import QColor, QImage, QPainter
-from qgis.core import QgsMapLayer
+from qgis.core import QgsMapLayer, QgsMapRendererCustomPainterJob, QgsMapSettings
 
+from .conf import PNG_QUALITY
 from . import qgis2threejstools as tools
 from .qgis2threejstools import logMessage
 
@@ -34,16 +35,17 @@ class DataManager:
 
     def __init__(self):
         self._list = []
+        self._indices = {}      # item -> index in the list. items must be hashable
 
     def count(self):
         return len(self._list)
 
     def _index(self, data):
-        if data in self._list:
-            return self._list.index(data)
-
-        index = len(self._list)
-        self._list.append(data)
+        index = self._indices.get(data)
+        if index is None:
+            index = len(self._list)
+            self._list.append(data)
+            self._indices[data] = index
         return index
 
 
@@ -59,6 +61,11 @@ class ImageManager(DataManager):
         self.exportSettings = exportSettings
         self._renderer = None
 
+        # caches. cleared every time map settings is set to export settings, and before building a layer
+        self._imageCache = {}
+        self._pluginLayerCache = {}     # layer IDs (or None for map settings layers) -> has plugin layer
+        self._cacheRevision = None
+
     def imageIndex(self, path):
         img = (self.IMAGE_FILE, path)
         return self._index(img)
@@ -72,7 +79,7 @@ class ImageManager(DataManager):
         return self._index(img)
 
     def layerImageIndex(self, layerids, width, height, extent, transp_background):
-        img = (self.LAYER_IMAGE, (layerids, width, height, extent, transp_background))
+        img = (self.LAYER_IMAGE, (tuple(layerids), width, height, extent, transp_background))
         return self._index(img)
 
     def mapCanvasImage(self, transp_background=False):
@@ -82,18 +89,10 @@ class ImageManager(DataManager):
 
     def renderedImage(self, width, height, extent, transp_background=False, layerids=None):
         # render layers with QgsMapRendererCustomPainterJob
-        from qgis.core import QgsMapRendererCustomPainterJob
         antialias = True
-        settings = self.exportSettings.mapSettings
 
-        # store old map settings
-        old_outputSize = settings.outputSize()
-        old_extent = settings.extent()
-        old_rotation = settings.rotation()
-        old_layers = settings.layers()
-        old_backgroundColor = settings.backgroundColor()
-
-        # map settings
+        # map settings (a copy, so that map settings of export settings are kept unchanged)
+        settings = QgsMapSettings(self.exportSettings.mapSettings)
         settings.setOutputSize(QSize(width, height))
         settings.setExtent(extent.unrotatedRect())
         settings.setRotation(extent.rotation())
@@ -104,14 +103,16 @@ class ImageManager(DataManager):
         if transp_background:
             settings.setBackgroundColor(QColor(Qt.transparent))
 
-        has_pluginlayer = False
-        for layer in settings.layers():
-            if layer and layer.type() == QgsMapLayer.PluginLayer:
-                has_pluginlayer = True
-                break
+        self._validateCache()
+        key = tuple(layerids) if layerids else None
+        has_pluginlayer = self._pluginLayerCache.get(key)
+        if has_pluginlayer is None:
+            has_pluginlayer = any(layer and layer.type() == QgsMapLayer.PluginLayer for layer in settings.layers())
+            self._pluginLayerCache[key] = has_pluginlayer
 
-        # create an image
         image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+
         painter = QPainter()
         painter.begin(image)
         if antialias:
@@ -125,17 +126,26 @@ class ImageManager(DataManager):
             job.start()
             job.waitForFinished()
         painter.end()
+        return image
+
+    def _validateCache(self):
+        # map settings may have been modified in place and set again, so compare revisions
+        revision = self.exportSettings.mapSettingsRevision
+        if revision != self._cacheRevision:
+            self._imageCache = {}
+            self._pluginLayerCache = {}
+            self._cacheRevision = revision
 
-        # restore map settings
-        settings.setOutputSize(old_outputSize)
-        settings.setExtent(old_extent)
-        settings.setRotation(old_rotation)
-        settings.setLayers(old_layers)
-        settings.setBackgroundColor(old_backgroundColor)
+    def image(self, index):
+        self._validateCache()
 
+        image = self._imageCache.get(index)
+        if image is None:
+            image = self._image(index)
+            self._imageCache[index] = image
         return image
 
-    def image(self, index):
+    def _image(self, index):
         image = self._list[index]
         imageType = image[0]
         if imageType == self.IMAGE_FILE:
@@ -160,6 +170,9 @@ class ImageManager(DataManager):
         transp_background = image[1]
         return self.mapCanvasImage(transp_background)
 
+    def clearCache(self):
+        self._imageCache = {}
+
     def base64image(self, index):
         image = self.image(index)
         if image:
@@ -167,11 +180,11 @@ class ImageManager(DataManager):
         return None
 
     def write(self, index, path):
-        self.image(index).save(path)
+        self.image(index).save(path, "PNG", PNG_QUALITY)
 
-    def writeAll(self, pathRoot):
+    def writeAll(self, pathRoot, quality=PNG_QUALITY):
         for i in range(self.count()):
-            self.image(i).save("{0}{1}.png".format(pathRoot, i))
+            self.image(i).save("{0}{1}.png".format(pathRoot, i), "PNG", quality)
 
 
 class MaterialManager(DataManager):
@@ -205,6 +218,15 @@ class MaterialManager(DataManager):
         self.imageManager = imageManager
         self.basicMaterialType = basicType
 
+        # functions that return image index and transparent background option for image material options
+        self._imageIndexFuncs = {
+            self.CANVAS_IMAGE: lambda opts: (imageManager.canvasImageIndex(opts), opts),
+            self.MAP_IMAGE: lambda opts: (imageManager.mapImageIndex(*opts), opts[3]),
+            self.LAYER_IMAGE: lambda opts: (imageManager.layerImageIndex(*opts), opts[4]),
+            self.IMAGE_FILE: lambda opts: (imageManager.imageIndex(opts[0]), opts[1]),
+            self.SPRITE_IMAGE: lambda opts: (imageManager.imageIndex(opts[0]), opts[1])
+        }
+
     def _indexCol(self, type, color, opacity=1, doubleSide=False, opts=None):
         if color[0:2] != "0x":
             color = self.ERROR_COLOR
@@ -238,7 +260,7 @@ class MaterialManager(DataManager):
         return self._index(mtl)
 
     def getLayerImageIndex(self, layerids, width, height, extent, opacity=1, transp_background=False):
-        mtl = (self.LAYER_IMAGE, None, opacity, True, (layerids, width, height, extent, transp_background))
+        mtl = (self.LAYER_IMAGE, None, opacity, True, (tuple(layerids), width, height, extent, transp_background))
         return self._index(mtl)
 
     def getImageFileIndex(self, path, opacity=1, transp_background=False, doubleSide=False):
@@ -260,25 +282,11 @@ class MaterialManager(DataManager):
         }
 
         if color is None:
-            if mt == self.CANVAS_IMAGE:
-                transp_background = opts
-                imgIndex = self.imageManager.canvasImageIndex(transp_background)
-            elif mt == self.MAP_IMAGE:
-                width, height, extent, transp_background = opts
-                imgIndex = self.imageManager.mapImageIndex(width, height, extent, transp_background)
-            elif mt == self.LAYER_IMAGE:
-                layerids, width, height, extent, transp_background = opts
-                imgIndex = self.imageManager.layerImageIndex(layerids, width, height, extent, transp_background)
-            elif mt == self.IMAGE_FILE:
-                imagepath, transp_background = opts
-                imgIndex = self.imageManager.imageIndex(imagepath)
-            elif mt == self.SPRITE_IMAGE:
-                path_url, transp_background = opts
-                if path_url.startswith("http:") or path_url.startswith("https:"):
-                    url = path_url
-                    filepath = None
-                else:
-                    imgIndex = self.imageManager.imageIndex(path_url)
+            if mt == self.SPRITE_IMAGE and opts[0].startswith(("http:", "https:")):
+                url, transp_background = opts
+                filepath = None
+            else:
+                imgIndex, transp_background = self._imageIndexFuncs[mt](opts)
 
             if url is None:
                 if base64:
@@ -355,26 +363,23 @@ class ModelManager(DataManager):
                 a.append({"url": url})
         return a
 
-    def hasColladaModel(self):
-        for f in self._list:
-            _, ext = os.path.splitext(f)
-            if ext == ".dae":
-                return True
-        return False
+    def modelExtensions(self):
+        """returns a set of model file extensions"""
+        return {os.path.splitext(f)[1] for f in self._list}
+
+    def hasColladaModel(self, exts=None):
+        return ".dae" in (exts or self.modelExtensions())
 
-    def hasGLTFModel(self):
-        for f in self._list:
-            _, ext = os.path.splitext(f)
-            if ext in [".gltf", ".glb"]:
-                return True
-        return False
+    def hasGLTFModel(self, exts=None):
+        return not (exts or self.modelExtensions()).isdisjoint((".gltf", ".glb"))
 
     def filesToCopy(self):
         f = []
         if self._list:
-            if self.hasColladaModel():
+            exts = self.modelExtensions()
+            if self.hasColladaModel(exts):
                 f.append({"files": ["js/threejs/loaders/ColladaLoader.js"], "dest": "threejs/loaders"})
-            if self.hasGLTFModel():
+            if self.hasGLTFModel(exts):
                 f.append({"files": ["js/threejs/loaders/GLTFLoader.js"], "dest": "threejs/loaders"})
             f.append({"files": self._list, "dest": "./data/{}/models".format(self.exportSettings.outputFileTitle())})
         return f
@@ -382,8 +387,9 @@ class ModelManager(DataManager):
     def scripts(self):
         s = []
         if self._list:
-            if self.hasColladaModel():
+            exts = self.modelExtensions()
+            if self.hasColladaModel(exts):
                 s.append("./threejs/loaders/ColladaLoader.js")
-            if self.hasGLTFModel():
+            if self.hasGLTFModel(exts):
                 s.append("./threejs/loaders/GLTFLoader.js")
         return s
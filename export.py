@@ -135,6 +135,8 @@ class ThreeJSExporter(ThreeJSBuilder):
         return self._index
 
     def buildLayer(self, layer, cancelSignal=None):
+        self.imageManager.clearCache()
+
         title = tools.abchex(self.nextLayerIndex())
 
         if self.settings.localMode:
@@ -254,7 +256,7 @@ class BridgeExporterBase:
         self.page.ready.connect(loop.quit)
         self.page.setViewportSize(QSize(width, height))
 
-        if self.page.mainFrame().url().isEmpty():
+        if self.page.myUrl is None:
             self.page.setup(self.settings, exportMode=self.exportMode)
         else:
             self.page.reload()
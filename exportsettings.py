@@ -21,6 +21,11 @@ import os
 import json
 from copy import deepcopy
 
+try:
+    import orjson     # faster JSON library (optional)
+except ImportError:
+    orjson = None
+
 from PyQt5.QtCore import QSettings, QSize
 from qgis.core import QgsCoordinateReferenceSystem, QgsCoordinateTransform, QgsMapLayer, QgsMapSettings, QgsProject, QgsWkbTypes
 
@@ -119,6 +124,7 @@ class ExportSettings:
     def __init__(self):
         self.data = {}
         self.mapSettings = None
+        self.mapSettingsRevision = 0    # incremented every time map settings is set
         self.baseExtent = None
         self.crs = None
 
@@ -131,6 +137,7 @@ class ExportSettings:
         # cache
         self._mapTo3d = None
         self._templateConfig = None
+        self._crsWkt = (None, None)     # (crs, WKT of the crs)
 
     def clear(self):
         self.data = {}
@@ -143,6 +150,7 @@ class ExportSettings:
     def copyTo(self, t):
         t.data = deepcopy(self.data)
         t.mapSettings = QgsMapSettings(self.mapSettings)
+        t.mapSettingsRevision += 1
         t.baseExtent = self.baseExtent.clone()
         t.crs = self.crs
         t.base64 = self.base64
@@ -179,6 +187,15 @@ class ExportSettings:
         self.data[ExportSettings.CONTROLS] = {"comboBox_Controls": name}
 
     def loadSettings(self, settings):
+        # numeric scene properties saved by older versions are strings
+        sp = settings.get(ExportSettings.SCENE, {})
+        for key in ["lineEdit_BaseSize", "lineEdit_zFactor", "lineEdit_zShift"]:
+            if isinstance(sp.get(key), str):
+                try:
+                    sp[key] = float(sp[key])
+                except ValueError:
+                    del sp[key]
+
         self.data = settings
         self._mapTo3d = None
         self.updateLayerList()
@@ -193,8 +210,12 @@ class ExportSettings:
                 return False
 
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                settings = json.load(f)
+            if orjson:
+                with open(filepath, "rb") as f:
+                    settings = orjson.loads(f.read())
+            else:
+                with open(filepath, "r", encoding="utf-8") as f:
+                    settings = json.load(f)
         except Exception as e:
             logMessage("Failed to load export settings from file. Error: " + str(e))
             self.updateLayerList()
@@ -208,8 +229,9 @@ class ExportSettings:
         self.loadSettings(settings)
         return True
 
-    def saveSettings(self, filepath=None):
-        """save settings to a JSON file"""
+    def saveSettings(self, filepath=None, pretty=False):
+        """save settings to a JSON file.
+           pretty: if True, output is indented and its keys are sorted. Otherwise output is compact."""
         if filepath is None:
             filepath = settingsFilePath()
             if filepath is None:
@@ -221,8 +243,17 @@ class ExportSettings:
             raise TypeError(repr(obj) + " is not JSON serializable")
 
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2, default=default, sort_keys=True)
+            # serialize whole data first and write it at once
+            if orjson:
+                option = (orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) if pretty else None
+                data = orjson.dumps(self.data, default=default, option=option)
+            elif pretty:
+                data = json.dumps(self.data, ensure_ascii=False, indent=2, default=default, sort_keys=True).encode("utf-8")
+            else:
+                data = json.dumps(self.data, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+            with open(filepath, "wb") as f:
+                f.write(data)
             return True
         except Exception as e:
             logMessage("Failed to save export settings: " + str(e))
@@ -274,6 +305,7 @@ class ExportSettings:
         """settings: QgsMapSettings"""
         self._mapTo3d = None
         self.mapSettings = settings
+        self.mapSettingsRevision += 1
 
         self.baseExtent = MapExtent.fromMapSettings(settings)
         self.crs = settings.destinationCrs()
@@ -289,7 +321,7 @@ class ExportSettings:
         baseSize = sp.get("lineEdit_BaseSize", DEF_SETS.BASE_SIZE)
         verticalExaggeration = sp.get("lineEdit_zFactor", DEF_SETS.Z_EXAGGERATION)
         verticalShift = sp.get("lineEdit_zShift", DEF_SETS.Z_SHIFT)
-        self._mapTo3d = MapTo3D(self.mapSettings, float(baseSize), float(verticalExaggeration), float(verticalShift))
+        self._mapTo3d = MapTo3D(self.mapSettings, baseSize, verticalExaggeration, verticalShift)
         return self._mapTo3d
 
     def templateConfig(self):
@@ -298,6 +330,14 @@ class ExportSettings:
         self._templateConfig = getTemplateConfig(self.template())
         return self._templateConfig
 
+    def crsWkt(self):
+        """returns WKT of destination CRS. the WKT is cached while the CRS object is not replaced"""
+        crs, wkt = self._crsWkt
+        if crs is not self.crs:
+            crs, wkt = self.crs, str(self.crs.toWkt())
+            self._crsWkt = (crs, wkt)
+        return wkt
+
     def wgs84Center(self):
         if self.crs and self.baseExtent:
             wgs84 = QgsCoordinateReferenceSystem("EPSG:4326")
@@ -319,14 +359,14 @@ class ExportSettings:
         if id.startswith("plugin:"):
             provider = pluginManager().findDEMProvider(id[7:])
             if provider:
-                return provider(str(self.crs.toWkt()))
+                return provider(self.crsWkt())
 
             logMessage('Plugin "{0}" not found'.format(id))
 
         else:
             layer = QgsProject.instance().mapLayer(id)
             if layer:
-                return GDALDEMProvider(layer.source(), str(self.crs.toWkt()), source_wkt=str(layer.crs().toWkt()))    # use CRS set to the layer in QGIS
+                return GDALDEMProvider(layer.source(), self.crsWkt(), source_wkt=str(layer.crs().toWkt()))    # use CRS set to the layer in QGIS
 
         return FlatDEMProvider()
 
@@ -376,12 +416,17 @@ class ExportSettings:
            Adds layer elements newly added to the project and removes layer elements
            deleted from the project. Also, renumbers layer ID."""
 
+        # existing layer elements by layer ID (first one has priority)
+        items = {}
+        for lyr in self.getLayerList():
+            items.setdefault(lyr.layerId, lyr)
+
         # Point cloud layers
         layers = [lyr for lyr in self.getLayerList() if lyr.layerId.startswith("pc:")]
 
         # DEM and vector layers
         for mapLayer in [ml for ml in getLayersInProject() if Layer.getGeometryType(ml) is not None]:
-            item = self.getItemByLayerId(mapLayer.id())
+            item = items.get(mapLayer.id())
             if item is None:
                 item = Layer.fromQgsMapLayer(mapLayer)
             else:
@@ -393,14 +438,14 @@ class ExportSettings:
         # DEM provider plugin layers
         for plugin in pluginManager().demProviderPlugins():
             layerId = "plugin:" + plugin.providerId()
-            item = self.getItemByLayerId(layerId)
+            item = items.get(layerId)
             if item is None:
                 item = Layer(layerId, plugin.providerName(), q3dconst.TYPE_DEM, visible=False)
             layers.append(item)
 
         # Flat plane
         layerId = "FLAT"
-        item = self.getItemByLayerId(layerId)
+        item = items.get(layerId)
         if item is None:
             item = Layer(layerId, "Flat Plane", q3dconst.TYPE_DEM, visible=False)
         layers.append(item)
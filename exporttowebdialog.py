@@ -18,19 +18,53 @@
  *                                                                         *
  ***************************************************************************/
 """
+import html
 import os
+import traceback
 from datetime import datetime
 
-from PyQt5.QtCore import Qt, QDir, QEventLoop, QUrl
+from PyQt5.QtCore import Qt, QDir, QObject, QThread, QUrl, pyqtSignal
 from PyQt5.QtGui import QDesktopServices
 from PyQt5.QtWidgets import QDialog, QFileDialog, QMessageBox
-from qgis.core import Qgis, QgsApplication, QgsProject
+from qgis.core import Qgis, QgsProject
 
 from .export import ThreeJSExporter
 from .qgis2threejstools import getTemplateConfig, openUrl, templateDir, temporaryOutputDir
 from .ui.exporttowebdialog import Ui_ExportToWebDialog
 
 
+class ExportWorker(QObject):
+
+    # signals
+    progressUpdated = pyqtSignal(int, str)
+    messageLogged = pyqtSignal(str, int)
+    cancelRequest = pyqtSignal()
+    finished = pyqtSignal(bool)
+
+    def __init__(self, settings, filepath):
+        super().__init__()
+
+        self.settings = settings
+        self.filepath = filepath
+
+    def run(self):
+        completed = False
+        try:
+            exporter = ThreeJSExporter(self.settings, self.progress, self.logMessage)
+            completed = exporter.export(self.filepath, cancelSignal=self.cancelRequest)
+        except Exception:
+            self.messageLogged.emit("Export failed with an error:<pre>{}</pre>".format(html.escape(traceback.format_exc())), Qgis.Critical)
+        finally:
+            # always notify the dialog so that it gets back to idle state
+            self.finished.emit(bool(completed))
+
+    def progress(self, percentage=None, msg=None):
+        self.progressUpdated.emit(-1 if percentage is None else percentage, msg or "")
+
+    def logMessage(self, msg, level=Qgis.Info):
+        self.messageLogged.emit(msg, level)
+
+
 class ExportToWebDialog(QDialog):
 
     def __init__(self, settings, page, parent=None):
@@ -42,6 +76,8 @@ class ExportToWebDialog(QDialog):
         self.logHtml = ""
         self.logNextIndex = 1
 
+        self.exportThread = self.exportWorker = None
+
         self.ui = Ui_ExportToWebDialog()
         self.ui.setupUi(self)
 
@@ -169,13 +205,32 @@ th {text-align:left;}
 </style>
 """
         self.progress(0, "Export has been started.")
-        t0 = datetime.now()
+        self.exportStarted = datetime.now()
+        self.exportParams = (settings, out_dir, filepath, local_mode)
+
+        # export in a worker thread so that the dialog keeps responding
+        self.exportThread = QThread(self)
+        self.exportWorker = ExportWorker(settings, filepath)
+        self.exportWorker.moveToThread(self.exportThread)
+
+        self.exportThread.started.connect(self.exportWorker.run)
+        self.exportWorker.progressUpdated.connect(self.progressNumbered)
+        self.exportWorker.messageLogged.connect(self.logMessageIndented)
+        self.exportWorker.finished.connect(self.exportFinished)
+        self.ui.pushButton_Cancel.clicked.connect(self.exportWorker.cancelRequest)
+
+        self.exportThread.start()
+
+    def exportFinished(self, completed):
+        elapsed = datetime.now() - self.exportStarted
 
-        # export
-        exporter = ThreeJSExporter(settings, self.progressNumbered, self.logMessageIndented)
-        completed = exporter.export(filepath, cancelSignal=self.ui.pushButton_Cancel.clicked)
+        self.exportThread.quit()
+        self.exportThread.wait()
+        self.exportWorker.deleteLater()
+        self.exportThread.deleteLater()
+        self.exportThread = self.exportWorker = None
 
-        elapsed = datetime.now() - t0
+        settings, out_dir, filepath, local_mode = self.exportParams
 
         for w in [self.ui.tabSettings, self.ui.pushButton_Export, self.ui.pushButton_Close]:
             w.setEnabled(True)
@@ -210,8 +265,14 @@ th {text-align:left;}
         self.ui.textBrowser.setHtml(self.logHtml)
         self.ui.textBrowser.scrollToAnchor("complete")
 
+    def reject(self):
+        # do not close the dialog while exporting
+        if self.exportThread:
+            return
+        QDialog.reject(self)
+
     def progress(self, percentage=None, msg=None, numbered=False):
-        if percentage is not None:
+        if percentage is not None and percentage >= 0:
             self.ui.progressBar.setValue(percentage)
 
             v = bool(percentage != 100)
@@ -225,8 +286,6 @@ th {text-align:left;}
             self.logHtml += "<div class='progress'>{}</div>".format(msg)
             self.ui.textBrowser.setHtml(self.logHtml)
 
-        QgsApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
-
     def progressNumbered(self, percentage=None, msg=None):
         self.progress(percentage, msg, numbered=True)
 
@@ -234,7 +293,5 @@ th {text-align:left;}
         self.logHtml += "<div{}>{}</div>".format(" class='indented'" if indented else "", msg)
         self.ui.textBrowser.setHtml(self.logHtml)
 
-        QgsApplication.processEvents(QEventLoop.ExcludeUserInputEvents)
-
     def logMessageIndented(self, msg, level=Qgis.Info):
         self.logMessage(msg, level, indented=True)
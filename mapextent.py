@@ -18,7 +18,7 @@
  ***************************************************************************/
 """
 import math
-from qgis.core import QgsPointXY, QgsRectangle, QgsGeometry
+from qgis.core import QgsGeometry, QgsMapSettings, QgsPointXY, QgsRectangle
 
 
 class MapExtent:
@@ -154,7 +154,6 @@ class MapExtent:
 
     def toMapSettings(self, mapSettings=None):
         if mapSettings is None:
-            from qgis.core import QgsMapSettings
             mapSettings = QgsMapSettings()
         mapSettings.setExtent(self._unrotated_rect)
         mapSettings.setRotation(self._rotation)
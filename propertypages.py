@@ -59,6 +59,11 @@ def is_number(val):
         return False
 
 
+def number_to_text(val):
+    """format a number without trailing ".0" if it is a whole number"""
+    return str(int(val)) if float(val).is_integer() else str(val)
+
+
 class PropertyPage(QWidget):
 
     def __init__(self, pageType, parent=None):
@@ -157,7 +162,7 @@ class PropertyPage(QWidget):
             elif isinstance(w, (QSlider, QSpinBox)):
                 w.setValue(v)
             elif isinstance(w, QLineEdit):
-                w.setText(v)
+                w.setText(number_to_text(v) if isinstance(v, (int, float)) else v)
             elif isinstance(w, StyleWidget):
                 if len(v):
                     w.setValues(v)
@@ -212,13 +217,12 @@ class ScenePropertyPage(PropertyPage, Ui_ScenePropertiesWidget):
 
     def properties(self):
         p = PropertyPage.properties(self)
-        # check validity
-        if not is_number(self.lineEdit_BaseSize.text()):
-            p["lineEdit_BaseSize"] = str(DEF_SETS.BASE_SIZE)
-        if not is_number(self.lineEdit_zFactor.text()):
-            p["lineEdit_zFactor"] = str(DEF_SETS.Z_EXAGGERATION)
-        if not is_number(self.lineEdit_zShift.text()):
-            p["lineEdit_zShift"] = str(DEF_SETS.Z_SHIFT)
+        # check validity and store numeric values as float
+        for w, defaultValue in [(self.lineEdit_BaseSize, DEF_SETS.BASE_SIZE),
+                                (self.lineEdit_zFactor, DEF_SETS.Z_EXAGGERATION),
+                                (self.lineEdit_zShift, DEF_SETS.Z_SHIFT)]:
+            text = w.text()
+            p[w.objectName()] = float(text if is_number(text) else defaultValue)
         return p
 
 
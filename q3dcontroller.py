@@ -19,6 +19,7 @@
  ***************************************************************************/
 """
 import time
+import traceback
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot, qDebug
 from qgis.core import QgsApplication
 
@@ -333,7 +334,6 @@ class Q3DController(QObject):
                     self.hideLayer(layer)
 
         except Exception as e:
-            import traceback
             logMessage(traceback.format_exc())
 
             self.iface.showMessageBar()
@@ -83,6 +83,7 @@ class Q3DTreeView(QTreeView):
 
         model = QStandardItemModel(0, 1)
         self.layerGroupItems = {}
+        self.layerItems = {}        # layer ID -> layer item
         for geomType, name in LAYER_GROUP_ITEMS:
             item = QStandardItem(name)
             item.setIcon(self.icons[geomType])
@@ -96,8 +97,7 @@ class Q3DTreeView(QTreeView):
 
         self.model().itemChanged.connect(self.treeItemChanged)
 
-    def addLayer(self, layer):
-        # add a layer item to tree view
+    def createLayerItem(self, layer):
         item = QStandardItem(layer.name)
         item.setCheckable(True)
         item.setCheckState(Qt.Checked if layer.visible else Qt.Unchecked)
@@ -105,46 +105,69 @@ class Q3DTreeView(QTreeView):
         item.setIcon(self.icons[layer.geomType])
         item.setEditable(False)
 
-        self.layerGroupItems[layer.geomType].appendRow([item])
+        self.layerItems[layer.layerId] = item
+        return item
+
+    def addLayer(self, layer):
+        # add a layer item to tree view
+        self.layerGroupItems[layer.geomType].appendRow([self.createLayerItem(layer)])
 
     def addLayers(self, layers):
+        # group layer items by geometry type and add them to each group item at once
+        items = {}
         for layer in layers:
-            self.addLayer(layer)
+            items.setdefault(layer.geomType, []).append(self.createLayerItem(layer))
+
+        # repaint once after all items have been added
+        self.setUpdatesEnabled(False)
+        try:
+            for geomType, children in items.items():
+                self.layerGroupItems[geomType].appendRows(children)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def removeLayer(self, layerId):
-        item = self.getItemByLayerId(layerId)
+        item = self.layerItems.pop(layerId, None)
         if item:
             item.parent().removeRow(item.row())
 
     def getItemByLayerId(self, layerId):
-        for parent in self.layerGroupItems.values():
-            for row in range(parent.rowCount()):
-                item = parent.child(row)
-                if item.data() == layerId:
-                    return item
-        return None
+        return self.layerItems.get(layerId)
 
     def updateLayersCheckState(self, settings):
         self.blockSignals(True)
-        for parent in self.layerGroupItems.values():
-            for row in range(parent.rowCount()):
-                item = parent.child(row)
-                layer = settings.getItemByLayerId(item.data())
-                item.setCheckState(Qt.Checked if layer and layer.visible else Qt.Unchecked)
-
-        self.blockSignals(False)
+        self.setUpdatesEnabled(False)
+        try:
+            for parent in self.layerGroupItems.values():
+                for row in range(parent.rowCount()):
+                    item = parent.child(row)
+                    layer = settings.getItemByLayerId(item.data())
+                    item.setCheckState(Qt.Checked if layer and layer.visible else Qt.Unchecked)
+        finally:
+            self.setUpdatesEnabled(True)
+            self.blockSignals(False)
 
     def uncheckAll(self):
-        for parent in self.layerGroupItems.values():
-            for idx in range(parent.rowCount()):
-                parent.child(idx).setCheckState(Qt.Unchecked)
+        # itemChanged signals are not blocked because they hide 3D objects from the scene
+        self.setUpdatesEnabled(False)
+        try:
+            for parent in self.layerGroupItems.values():
+                for idx in range(parent.rowCount()):
+                    parent.child(idx).setCheckState(Qt.Unchecked)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def treeItemChanged(self, item):
         layer = self.iface.settings.getItemByLayerId(item.data())
         if layer is None:
             return
 
-        layer.visible = (item.checkState() == Qt.Checked)
+        # item text changed, but visibility not changed
+        visible = (item.checkState() == Qt.Checked)
+        if layer.visible == visible:
+            return
+
+        layer.visible = visible
         if layer.visible and not layer.properties:
             layer.properties = self.iface.wnd.getDefaultProperties(layer)
 
@@ -187,4 +210,6 @@ class Q3DTreeView(QTreeView):
     def clearPointCloudLayers(self):
         parent = self.layerGroupItems[q3dconst.TYPE_POINTCLOUD]
         if parent.hasChildren():
+            for row in range(parent.rowCount()):
+                self.layerItems.pop(parent.child(row).data(), None)
             parent.removeRows(0, parent.rowCount())
@@ -26,7 +26,7 @@ from PyQt5.QtCore import (Qt, QByteArray, QBuffer, QDir, QEventLoop, QIODevice,
 from PyQt5.QtGui import QImage, QPainter
 from PyQt5.QtWidgets import QDialog, QFileDialog, QMessageBox, QVBoxLayout
 
-from .conf import DEBUG_MODE
+from .conf import DEBUG_MODE, PNG_QUALITY
 try:
     from PyQt5.QtWebKit import QWebSettings, QWebSecurityOrigin
     from PyQt5.QtWebKitWidgets import QWebPage, QWebView
@@ -38,15 +38,26 @@ except ModuleNotFoundError:
     raise
 
 from . import q3dconst
-from .qgis2threejstools import js_bool, logMessage, pluginDir
+from .qgis2threejstools import js_bool, logMessage, pluginDir, readIfModified, readTextFile
 
 
 def base64image(image):
     ba = QByteArray()
     buffer = QBuffer(ba)
     buffer.open(QIODevice.WriteOnly)
-    image.save(buffer, "PNG")
-    return "data:image/png;base64," + ba.toBase64().data().decode("ascii")
+    try:
+        image.save(buffer, "PNG", PNG_QUALITY)
+    finally:
+        buffer.close()
+    return "data:image/png;base64," + bytes(ba.toBase64()).decode("ascii")
+
+
+_htmlCache = {}    # path -> (mtime, html)
+
+
+def readHtml(path):
+    """read a html file. the file is read again only if it has been modified"""
+    return readIfModified(path, _htmlCache, readTextFile)
 
 
 class Bridge(QObject):
@@ -107,6 +118,11 @@ class Bridge(QObject):
 
 class Q3DWebPage(QWebPage):
 
+    LOG_FLUSH_LINES = 20          # log file is flushed every this number of lines...
+    LOG_FLUSH_INTERVAL = 1000     # ...and at this interval (msec)
+
+    _logOpened = False            # log file is truncated only when it is opened first in the session
+
     ready = pyqtSignal()
     sceneLoaded = pyqtSignal()
     sceneLoadError = pyqtSignal()
@@ -115,10 +131,20 @@ class Q3DWebPage(QWebPage):
         QWebPage.__init__(self, parent)
 
         self.loadedScripts = {}
+        self.myUrl = None
 
         if DEBUG_MODE == 2:
-            # open log file
-            self.logfile = open(pluginDir("q3dview.log"), "w")
+            # open log file. pages opened later append lines to the same file
+            self.logfile = open(pluginDir("q3dview.log"), "a" if Q3DWebPage._logOpened else "w")
+            Q3DWebPage._logOpened = True
+            self.logLines = 0
+
+            self.logTimer = QTimer(self)
+            self.logTimer.setInterval(self.LOG_FLUSH_INTERVAL)
+            self.logTimer.timeout.connect(self.logfile.flush)
+            self.logTimer.start()
+
+            self.destroyed.connect(self.logfile.close)
 
     def setup(self, settings, wnd=None, exportMode=False):
         """wnd: Q3DWindow or None (off-screen mode)"""
@@ -152,10 +178,11 @@ class Q3DWebPage(QWebPage):
 
         url = os.path.join(os.path.abspath(os.path.dirname(__file__)), "viewer", "viewer.html").replace("\\", "/")
         self.myUrl = QUrl.fromLocalFile(url)
-        self.mainFrame().setUrl(self.myUrl)
+        self.reload()
 
     def reload(self):
-        self.mainFrame().setUrl(self.myUrl)
+        # html is read from disk only once. relative paths in the html are resolved with base url
+        self.mainFrame().setHtml(readHtml(self.myUrl.toLocalFile()), self.myUrl)
 
     def pageLoaded(self, ok):
         self.loadedScripts = {}
@@ -187,9 +214,7 @@ class Q3DWebPage(QWebPage):
             qDebug("runScript: {}".format(message if message else string).encode("utf-8"))
 
             if DEBUG_MODE == 2:
-                now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                self.logfile.write("{} runScript: {}\n".format(now, message if message else string))
-                self.logfile.flush()
+                self.writeLog("runScript: {}".format(message if message else string))
 
         return self.mainFrame().evaluateJavaScript(string)
 
@@ -297,9 +322,16 @@ class Q3DWebPage(QWebPage):
         self.wnd.printConsoleMessage(message, lineNumber, sourceID)
 
         if DEBUG_MODE == 2:
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.logfile.write("{} {} ({}: {})\n".format(now, message, sourceID, lineNumber))
+            self.writeLog("{} ({}: {})".format(message, sourceID, lineNumber))
+
+    def writeLog(self, line):
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.logfile.write("{} {}\n".format(now, line))
+
+        self.logLines += 1
+        if self.logLines >= self.LOG_FLUSH_LINES:
             self.logfile.flush()
+            self.logLines = 0
 
 
 class Q3DView(QWebView):
@@ -31,6 +31,7 @@ from . import q3dconst
 from .conf import DEBUG_MODE, RUN_CNTLR_IN_BKGND, PLUGIN_VERSION
 from .exportsettings import ExportSettings, Layer
 from .pluginmanager import pluginManager
+from .pluginsettings import SettingsDialog
 from .propertypages import ScenePropertyPage, DEMPropertyPage, VectorPropertyPage, PointCloudPropertyPage
 from .q3dcontroller import Q3DController
 from .q3dinterface import Q3DInterface
@@ -269,7 +270,7 @@ class Q3DWindow(QMainWindow):
         if os.path.splitext(filename)[1].lower() != ".qto3settings":
             filename += ".qto3settings"
 
-        self.settings.saveSettings(filename)
+        self.settings.saveSettings(filename, pretty=True)
 
         self.lastDir = os.path.dirname(filename)
 
@@ -365,7 +366,6 @@ class Q3DWindow(QMainWindow):
             self.lastDir = os.path.dirname(filename)
 
     def pluginSettings(self):
-        from .pluginsettings import SettingsDialog
         dialog = SettingsDialog(self)
         if dialog.exec_():
             pluginManager().reloadPlugins()
@@ -389,6 +389,10 @@ class Q3DWindow(QMainWindow):
     def updateLayerProperties(self, layer):
         orig_layer = self.settings.getItemByLayerId(layer.layerId)
 
+        # nothing to update (e.g. OK button clicked after Apply button without any change)
+        if layer.name == orig_layer.name and layer.properties == orig_layer.properties:
+            return
+
         if layer.name != orig_layer.name:
             item = self.ui.treeView.getItemByLayerId(layer.layerId)
             if item:
@@ -19,9 +19,9 @@
  *                                                                         *
  ***************************************************************************/
 """
-import struct
+import numpy
 
-from math import floor
+from math import cos, floor, radians, sin
 from osgeo import gdal
 from PyQt5.QtCore import QSize
 
@@ -52,16 +52,26 @@ class MapTo3D:
         self.multiplier = planeWidth / self.mapExtent.width()
         self.multiplierZ = self.multiplier * verticalExaggeration
 
+        # affine coefficients of xy transformation
+        #   x' = ax * x + bx * y + cx
+        #   y' = ay * x + by * y + cy
+        center = self.mapExtent.center()
+        theta = radians(-self.mapExtent.rotation())
+        kx = self.planeWidth / self._width
+        ky = self.planeHeight / self._height
+        self._ax, self._bx = (cos(theta) * kx, -sin(theta) * kx)
+        self._ay, self._by = (sin(theta) * ky, cos(theta) * ky)
+        self._cx = -(self._ax * center.x() + self._bx * center.y())
+        self._cy = -(self._ay * center.x() + self._by * center.y())
+
     def transform(self, x, y, z=0):
-        x, y = self.mapExtent.normalizePoint(x, y)
-        return [(x - 0.5) * self.planeWidth,
-                (y - 0.5) * self.planeHeight,
+        return [self._ax * x + self._bx * y + self._cx,
+                self._ay * x + self._by * y + self._cy,
                 (z + self.verticalShift) * self.multiplierZ]
 
     def transformXY(self, x, y, z=0):
-        x, y = self.mapExtent.normalizePoint(x, y)
-        return [(x - 0.5) * self.planeWidth,
-                (y - 0.5) * self.planeHeight,
+        return [self._ax * x + self._bx * y + self._cx,
+                self._ay * x + self._by * y + self._cy,
                 z]
 
     def transformRotated(self, x, y, z=0):
@@ -101,7 +111,12 @@ class GDALDEMProvider:
         self.width = self.ds.RasterXSize
         self.height = self.ds.RasterYSize
 
-    def _read(self, width, height, geotransform):
+        # buffers for reading values at a point
+        self._buf1x1 = numpy.empty((1, 1), dtype=numpy.float32)
+        self._buf2x2 = numpy.empty((2, 2), dtype=numpy.float32)
+
+    def _warp(self, width, height, geotransform):
+        """returns a reprojected memory dataset"""
         # create a memory dataset
         warped_ds = self.mem_driver.Create("", width, height, 1, gdal.GDT_Float32)
         warped_ds.SetProjection(self.dest_wkt)
@@ -109,28 +124,33 @@ class GDALDEMProvider:
 
         # reproject image
         gdal.ReprojectImage(self.ds, warped_ds, self.source_wkt, None, gdal.GRA_Bilinear)
+        return warped_ds
 
-        band = warped_ds.GetRasterBand(1)
-        return band.ReadRaster(0, 0, width, height, buf_type=gdal.GDT_Float32)
+    def _read(self, width, height, geotransform, buf=None):
+        """buf: numpy array of shape (height, width) to read values into (optional)"""
+        warped_ds = self._warp(width, height, geotransform)
+        return warped_ds.GetRasterBand(1).ReadAsArray(buf_obj=buf).ravel()
 
     def read(self, width, height, extent):
         """read data into a byte array"""
-        return self._read(width, height, extent.geotransform(width, height))
+        warped_ds = self._warp(width, height, extent.geotransform(width, height))
+        return warped_ds.GetRasterBand(1).ReadRaster(0, 0, width, height, buf_type=gdal.GDT_Float32)
 
     def readValues(self, width, height, extent):
-        """read data into a list"""
-        return struct.unpack("f" * width * height, self.read(width, height, extent))
+        """read data into a numpy array"""
+        return self._read(width, height, extent.geotransform(width, height))
 
     def readAsGridGeometry(self, width, height, extent):
+        # GridGeometry accesses values one by one, which is faster with a list
         return GridGeometry(extent,
                             width - 1, height - 1,
-                            self.readValues(width, height, extent))
+                            self.readValues(width, height, extent).tolist())
 
     def readValue(self, x, y):
         """get value at specified position using 1px * 1px memory raster"""
         res = 0.1
         geotransform = [x - res / 2, res, 0, y + res / 2, 0, -res]
-        return struct.unpack("f", self._read(1, 1, geotransform))[0]
+        return float(self._read(1, 1, geotransform, self._buf1x1)[0])
 
     def readValueOnTriangles(self, x, y, xmin, ymin, xres, yres):
         mx0 = floor((x - xmin) / xres)
@@ -138,7 +158,7 @@ class GDALDEMProvider:
         px0 = xmin + xres * mx0
         py0 = ymin + yres * my0
         geotransform = [px0, xres, 0, py0 + yres, 0, -yres]
-        z = struct.unpack("f" * 4, self._read(2, 2, geotransform))
+        z = self._read(2, 2, geotransform, self._buf2x2).tolist()
 
         sdx = (x - px0) / xres
         sdy = (y - py0) / yres
@@ -157,10 +177,11 @@ class FlatDEMProvider:
         return "Flat Plane"
 
     def read(self, width, height, extent):
-        return struct.pack("{0}f".format(width * height), *([self.value] * width * height))
+        return numpy.full(width * height, self.value, dtype=numpy.float32).tobytes()
 
     def readValues(self, width, height, extent):
-        return [self.value] * width * height
+        """returns a read-only numpy array"""
+        return numpy.broadcast_to(numpy.float32(self.value), width * height)
 
     def readAsGridGeometry(self, width, height, extent):
         return GridGeometry(extent,
@@ -174,15 +195,16 @@ class FlatDEMProvider:
 def calculateDEMSize(canvasSize, sizeLevel, roughness=0):
     width, height = canvasSize.width(), canvasSize.height()
     size = 100 * sizeLevel
-    s = (size * size / (width * height)) ** 0.5
-    if s < 1:
+    if size * size < width * height:
+        s = (size * size / (width * height)) ** 0.5
         width = int(width * s)
         height = int(height * s)
 
     if roughness:
-        if width % roughness != 0:
-            width = int(width / roughness + 0.9) * roughness
-        if height % roughness != 0:
-            height = int(height / roughness + 0.9) * roughness
+        # round up to multiples of roughness
+        if width % roughness:
+            width = -(-width // roughness) * roughness
+        if height % roughness:
+            height = -(-height // roughness) * roughness
 
     return QSize(width + 1, height + 1)
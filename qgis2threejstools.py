@@ -30,7 +30,7 @@ from PyQt5.QtGui import QDesktopServices
 from PyQt5.QtWidgets import QMessageBox
 from qgis.core import NULL, Qgis, QgsMapLayer, QgsMessageLog, QgsProject
 
-from .conf import DEBUG_MODE
+from .conf import DEBUG_MODE, PNG_QUALITY
 
 
 def getLayersInProject():
@@ -124,7 +124,7 @@ def shortTextFromSelectedLayerIds(layerIds):
 
 def openUrl(url):
     """url: QUrl object"""
-    if url.fileName().endswith((".html", ".htm")):
+    if os.path.splitext(url.fileName())[1].lower() in (".html", ".htm"):
         settings = QSettings()
         browserPath = settings.value("/Qgis2threejs/browser", "", type=str)
         if browserPath:
@@ -144,8 +144,11 @@ def base64image(image):
     ba = QByteArray()
     buffer = QBuffer(ba)
     buffer.open(QIODevice.WriteOnly)
-    image.save(buffer, "PNG")
-    return "data:image/png;base64," + ba.toBase64().data().decode("ascii")
+    try:
+        image.save(buffer, "PNG", PNG_QUALITY)
+    finally:
+        buffer.close()
+    return "data:image/png;base64," + bytes(ba.toBase64()).decode("ascii")
 
 
 def base64file(file_path):
@@ -157,20 +160,47 @@ def base64file(file_path):
         return None
 
 
+def readIfModified(path, cache, load):
+    """returns load(path). the result is cached in cache dict (path -> (mtime, result))
+       and load is called again only if the file has been modified.
+       raises OSError if the file does not exist."""
+    mtime = os.stat(path).st_mtime_ns
+    cached = cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    result = load(path)
+    cache[path] = (mtime, result)
+    return result
+
+
+def readTextFile(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+_templateConfigCache = {}    # meta file path -> (mtime, config)
+
+
 def getTemplateConfig(template_path):
     abspath = os.path.join(templateDir(), template_path)
     meta_path = os.path.splitext(abspath)[0] + ".txt"
 
-    if not os.path.exists(meta_path):
+    def parse(path):
+        parser = configparser.ConfigParser()
+        parser.read(path)
+        config = {"path": abspath}
+        for item in parser.items("general"):
+            config[item[0]] = item[1]
+        if DEBUG_MODE:
+            qDebug("config: " + str(config))
+        return config
+
+    try:
+        config = readIfModified(meta_path, _templateConfigCache, parse)
+    except OSError:
         return {}
-    parser = configparser.ConfigParser()
-    parser.read(meta_path)
-    config = {"path": abspath}
-    for item in parser.items("general"):
-        config[item[0]] = item[1]
-    if DEBUG_MODE:
-        qDebug("config: " + str(config))
-    return config
+    return dict(config)
 
 
 def copyFile(source, dest, overwrite=False):